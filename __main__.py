@@ -7,11 +7,13 @@ import os
 
 cache_path = f"{os.getcwd()}/.bag_recorder_cache"
 
-excluded_topics = [
-    "/rosout",
-    "/rosout_agg",
-    "/parameter_events",
-]
+excluded_topics = frozenset(
+    {
+        "/rosout",
+        "/rosout_agg",
+        "/parameter_events",
+    }
+)
 
 if os.getenv("ROS_VERSION") == "2":
     topic_list_command = ["ros2", "topic", "list"]
@@ -20,16 +22,27 @@ else:
     topic_list_command = ["rostopic", "list"]
     bag_record_command = ["rosbag", "record"]
 
-topic_list_result = subprocess.run(topic_list_command, capture_output=True, text=True)
+topic_list_process = subprocess.Popen(
+    topic_list_command, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+)
 
-if topic_list_result.stderr:
-    print(topic_list_result.stderr)
+last_recorded_topics = None
+try:
+    with open(cache_path, "r") as f:
+        last_recorded_topics = set(map(str.rstrip, f))
+except FileNotFoundError:
+    pass
+
+topic_list_stdout, topic_list_stderr = topic_list_process.communicate()
+
+if topic_list_stderr:
+    print(topic_list_stderr.decode())
     exit(1)
 
 topic_list = [
     topic
-    for topic in topic_list_result.stdout.rstrip("\r\n").split("\n")
-    if topic not in excluded_topics
+    for topic in topic_list_stdout.decode("utf-8").splitlines()
+    if topic and topic not in excluded_topics
 ]
 
 if not topic_list:
@@ -37,12 +50,8 @@ if not topic_list:
     exit(1)
 
 check_list = None
-try:
-    with open(cache_path, "r") as f:
-        last_recorded_topics = [s.rstrip() for s in f.readlines()]
+if last_recorded_topics is not None:
     check_list = [topic in last_recorded_topics for topic in topic_list]
-except FileNotFoundError:
-    pass
 
 topics_check = CheckScroll(
     prompt="Choose topics to record:",
@@ -59,8 +68,9 @@ try:
     if not topics_to_record:
         exit()
     with open(cache_path, "w") as f:
-        f.write("\n".join(topics_to_record))
+        f.writelines(f"{topic}\n" for topic in topics_to_record)
     options = sys.argv[1:] if len(sys.argv) > 1 else []
-    subprocess.run(bag_record_command + topics_to_record + options)
+    sys.stdout.flush()
+    os.execvp(bag_record_command[0], bag_record_command + topics_to_record + options)
 except KeyboardInterrupt:
     exit()
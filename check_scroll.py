@@ -1,7 +1,52 @@
 import bullet
-import bullet.charDef
+import io
+import os
+import select
+import sys
+import termios
+import tty
+from bullet.charDef import (
+    ARROW_DOWN_KEY,
+    ARROW_KEY_BEGIN,
+    ARROW_KEY_END,
+    ARROW_KEY_FLAG,
+    ARROW_KEY_INT,
+    ARROW_UP_KEY,
+    ESC_KEY,
+    INTERRUPT_KEY,
+    NEWLINE_KEY,
+    SPACE_CHAR,
+    UNDEFINED_KEY,
+)
+from bullet.colors import RESET, REVERSE
+from contextlib import contextmanager
+from itertools import compress
 from typing import List
 
+ERASE_LINE = "\x1b[K"
+
+SCROLL_KEYS = {
+    ARROW_UP_KEY: -1,
+    ARROW_DOWN_KEY: 1,
+}
+INPUT_CHUNK_SIZE = 64
+
+
+@contextmanager
+def _rawInput(fd):
+    old_mode = termios.tcgetattr(fd)
+    mode = termios.tcgetattr(fd)
+    mode[tty.IFLAG] &= ~(termios.ICRNL | termios.IXON)
+    mode[tty.LFLAG] &= ~(termios.ECHO | termios.ICANON | termios.ISIG | termios.IEXTEN)
+    mode[tty.CC][termios.VMIN] = 1
+    mode[tty.CC][termios.VTIME] = 0
+    termios.tcsetattr(fd, termios.TCSADRAIN, mode)
+    try:
+        yield
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old_mode)
+
+
 @bullet.keyhandler.init
 class CheckScroll:
     def __init__(
@@ -22,7 +67,10 @@ class CheckScroll:
 
         self.prompt = prompt
         self.choices = choices
-        self.checked = checked if checked is not None else [False] * len(self.choices)
+        self._mask = 0
+        for i, c in enumerate(checked or ()):
+            if c:
+                self._mask |= 1 << i
         self.pos = 0
 
         self.align = align
@@ -32,119 +80,191 @@ class CheckScroll:
 
         self.check = check
 
-        self.max_width = len(max(self.choices, key=len))
+        self._choice_lens = list(map(len, self.choices))
+        self.max_width = max(self._choice_lens)
         self.height = min(len(self.choices), height)
 
         self.top = 0
 
+        indent = " " * self.align
+        self._sel_head = (indent + REVERSE).encode()
+        self._sel_tail = (RESET + "\r").encode()
+        self._norm_head = indent.encode()
+        self._norm_tail = (ERASE_LINE + "\r").encode()
+        self._border_head = (
+            " " * (self.align + len(self.check) + self.margin)
+        ).encode()
+        self._border_tail = (ERASE_LINE + "\r").encode()
+        gap = " " * self.margin
+        blank = " " * len(self.check)
+        self._row_cache_checked = [
+            f"{self.check}{gap}{c}".encode() for c in self.choices
+        ]
+        self._row_cache_unchecked = [f"{blank}{gap}{c}".encode() for c in self.choices]
+        self._row_pads = [b" " * (self.max_width - n) for n in self._choice_lens]
+
+        self._buf = io.BytesIO()
+        self._emit = self._buf.write
+
+    def _flush(self):
+        data = memoryview(self._buf.getvalue())
+        self._buf.seek(0)
+        self._buf.truncate()
+        while data:
+            data = data[os.write(self._out_fd, data) :]
+
+    def _moveCursorUp(self, n):
+        self._emit(b"\x1b[%dA" % n)
+
+    def _moveCursorDown(self, n):
+        self._emit(b"\x1b[%dB" % n)
+
     def renderRows(self):
         self.printBorder(indicator=self.up_indicator if self.top != 0 else "")
-        bullet.utils.forceWrite("\n")
+        self._emit(b"\n")
         bottom = self.top + self.height
-        for i in range(self.top, bottom):
-            self.printRow(i)
-            bullet.utils.forceWrite("\n")
+        for i in range(self.top, self.pos):
+            self._printNormalRow(i)
+            self._emit(b"\n")
+        self._printSelectedRow(self.pos)
+        self._emit(b"\n")
+        for i in range(self.pos + 1, bottom):
+            self._printNormalRow(i)
+            self._emit(b"\n")
         self.printBorder(
             indicator=self.down_indicator if bottom < len(self.choices) else ""
         )
 
     def printRow(self, idx):
-        bullet.utils.forceWrite(" " * self.align)
-        bg_color = (
-            bullet.colors.REVERSE
-            if idx == self.pos
-            else bullet.colors.background["default"]
-        )
-        fg_color = (
-            bullet.colors.REVERSE
-            if idx == self.pos
-            else bullet.colors.foreground["default"]
-        )
-
-        if self.checked[idx]:
-            bullet.utils.cprint(
-                self.check + " " * self.margin, fg_color, bg_color, end=""
-            )
+        if idx == self.pos:
+            self._printSelectedRow(idx)
         else:
-            bullet.utils.cprint(
-                " " * (len(self.check) + self.margin), fg_color, bg_color, end=""
-            )
-        bullet.utils.cprint(self.choices[idx], fg_color, bg_color, end="")
-        bullet.utils.cprint(
-            " " * (self.max_width - len(self.choices[idx])), on=bg_color, end=""
+            self._printNormalRow(idx)
+
+    def _rowBody(self, idx):
+        if (self._mask >> idx) & 1:
+            return self._row_cache_checked[idx]
+        return self._row_cache_unchecked[idx]
+
+    def _printSelectedRow(self, idx):
+        self._emit(
+            self._sel_head + self._rowBody(idx) + self._row_pads[idx] + self._sel_tail
         )
-        bullet.utils.moveCursorHead()
+
+    def _printNormalRow(self, idx):
+        self._emit(self._norm_head + self._rowBody(idx) + self._norm_tail)
 
     def printBorder(self, indicator=""):
-        bullet.utils.forceWrite(" " * (self.align + len(self.check) + self.margin))
-        bullet.utils.cprint(indicator, end="")
-        bullet.utils.moveCursorHead()
+        self._emit(self._border_head + indicator.encode() + self._border_tail)
 
-    @bullet.keyhandler.register(bullet.charDef.SPACE_CHAR)
+    @bullet.keyhandler.register(SPACE_CHAR)
     def toggleRow(self):
-        self.checked[self.pos] = not self.checked[self.pos]
+        self._mask ^= 1 << self.pos
         self.printRow(self.pos)
+        self._flush()
 
-    @bullet.keyhandler.register(bullet.charDef.ARROW_UP_KEY)
+    @bullet.keyhandler.register(ARROW_UP_KEY)
     def moveUp(self):
-        if self.pos == self.top:
-            if self.top == 0:
-                return
-            else:
-                bullet.utils.moveCursorUp(1)
-                bullet.utils.clearConsoleDown(self.height + 1)
-                self.pos, self.top = self.pos - 1, self.top - 1
-                self.renderRows()
-                bullet.utils.moveCursorUp(self.height)
-        else:
-            bullet.utils.clearLine()
-            self.pos -= 1
-            self.printRow(self.pos + 1)
-            bullet.utils.moveCursorUp(1)
-            self.printRow(self.pos)
+        self.moveBy(-1)
 
-    @bullet.keyhandler.register(bullet.charDef.ARROW_DOWN_KEY)
+    @bullet.keyhandler.register(ARROW_DOWN_KEY)
     def moveDown(self):
-        if self.pos == self.top + self.height - 1:
-            if self.top + self.height == len(self.choices):
-                return
-            else:
-                bullet.utils.moveCursorDown(1)
-                bullet.utils.clearConsoleUp(self.height + 2)
-                bullet.utils.moveCursorDown(1)
-                self.pos, self.top = self.pos + 1, self.top + 1
-                self.renderRows()
-                bullet.utils.moveCursorUp(1)
+        self.moveBy(1)
+
+    def moveBy(self, delta):
+        pos = min(max(self.pos + delta, 0), len(self.choices) - 1)
+        if pos == self.pos:
+            return
+        top = min(max(self.top, pos - self.height + 1), pos)
+        if top != self.top:
+            self._moveCursorUp(self.pos - self.top + 1)
+            self.pos, self.top = pos, top
+            self.renderRows()
+            self._moveCursorUp(self.top + self.height - self.pos)
         else:
-            bullet.utils.clearLine()
-            self.pos += 1
-            self.printRow(self.pos - 1)
-            bullet.utils.moveCursorDown(1)
-            self.printRow(self.pos)
+            prev, self.pos = self.pos, pos
+            self.printRow(prev)
+            if pos < prev:
+                self._moveCursorUp(prev - pos)
+            else:
+                self._moveCursorDown(pos - prev)
+            self.printRow(pos)
+        self._flush()
 
-    @bullet.keyhandler.register(bullet.charDef.NEWLINE_KEY)
+    @bullet.keyhandler.register(NEWLINE_KEY)
     def accept(self):
-        bullet.utils.moveCursorDown(self.top + self.height - self.pos + 1)
-        bullet.utils.forceWrite("\n")
-        ret = [self.choices[i] for i in range(len(self.choices)) if self.checked[i]]
+        self._moveCursorDown(self.top + self.height - self.pos + 1)
+        self._emit(b"\n")
+        self._flush()
+        ret = list(
+            compress(
+                self.choices,
+                ((self._mask >> i) & 1 for i in range(len(self.choices))),
+            )
+        )
         self.pos = 0
-        self.checked = [False] * len(self.choices)
+        self._mask = 0
         return ret
 
-    @bullet.keyhandler.register(bullet.charDef.INTERRUPT_KEY)
+    @bullet.keyhandler.register(INTERRUPT_KEY)
     def interrupt(self):
         d = self.top + self.height - self.pos
-        bullet.utils.moveCursorDown(d)
+        self._moveCursorDown(d)
+        self._flush()
         raise KeyboardInterrupt
 
     def launch(self):
+        self._fd = sys.stdin.fileno()
+        self._out_fd = sys.stdout.fileno()
+        self._input = bytearray()
+        sys.stdout.flush()
         if self.prompt:
-            bullet.utils.forceWrite(self.prompt + "\n")
+            self._emit((self.prompt + "\n").encode())
         self.renderRows()
-        bullet.utils.forceWrite("\n")
-        bullet.utils.moveCursorUp(self.height + 1)
-        with bullet.cursor.hide():
+        self._emit(b"\n")
+        self._moveCursorUp(self.height + 1)
+        self._flush()
+        with bullet.cursor.hide(), _rawInput(self._fd):
             while True:
-                ret = self.handle_input()
+                ret = self._handleInput()
                 if ret is not None:
                     return ret
+
+    def _readByte(self):
+        if not self._input:
+            self._input += os.read(self._fd, INPUT_CHUNK_SIZE)
+            if not self._input:
+                return None
+        c = self._input[0]
+        del self._input[0]
+        return c
+
+    def _readKey(self):
+        c = self._readByte()
+        if c != ESC_KEY:
+            return UNDEFINED_KEY if c is None else c
+        if self._readByte() != ARROW_KEY_INT:
+            return UNDEFINED_KEY
+        c = self._readByte()
+        if c is not None and ARROW_KEY_BEGIN <= c + ARROW_KEY_FLAG <= ARROW_KEY_END:
+            return c + ARROW_KEY_FLAG
+        return UNDEFINED_KEY
+
+    def _keyPending(self):
+        return bool(self._input) or bool(select.select([self._fd], [], [], 0)[0])
+
+    def _handleInput(self):
+        key = self._readKey()
+        delta = 0
+        while key in SCROLL_KEYS:
+            delta += SCROLL_KEYS[key]
+            if not self._keyPending():
+                key = None
+                break
+            key = self._readKey()
+        if delta:
+            self.moveBy(delta)
+        handler = self._key_handler.get(key)
+        if handler is not None:
+            return handler(self)
+        return None